@@ -1,37 +1,32 @@
-#include <cupy/complex.cuh>
-
 #ifndef M_PI
 #define M_PI 3.1415926535897932384626433832795f
 #endif
 
 extern "C" __global__ void
 paganin_filter_gen(int width1, int height1, float resolution, float wavelength,
-                   float distance, float ratio, complex<float> *filtercomplex) {
+                   float distance, float ratio, float *filter) {
+  // the filter only covers the non-negative frequencies along x,
+  // matching the output of a real-to-complex FFT
+  int width_half = width1 / 2 + 1;
   int px = threadIdx.x + blockIdx.x * blockDim.x;
   int py = threadIdx.y + blockIdx.y * blockDim.y;
-  if (px >= width1)
+  if (px >= width_half)
     return;
   if (py >= height1)
     return;
 
   float dpx = 1.0f / (width1 * resolution);
   float dpy = 1.0f / (height1 * resolution);
-  int centerx = (width1 + 1) / 2 - 1;
-  int centery = (height1 + 1) / 2 - 1;
 
-  float pxx = (px - centerx) * dpx;
-  float pyy = (py - centery) * dpy;
+  // frequencies in FFT order (not shifted), so that the filter is symmetric
+  // and keeps the spectrum of the real input Hermitian. Unlike in Savu, the
+  // zero frequency is not shifted by one bin for even sizes
+  int fy = py <= height1 / 2 ? py : py - height1;
+
+  float pxx = px * dpx;
+  float pyy = fy * dpy;
   float pd = (pxx * pxx + pyy * pyy) * wavelength * distance * M_PI;
-             ;
   float filter1 = 1.0f + ratio * pd;
 
-  complex<float> value = 1.0f / complex<float>(filter1, filter1);
-
-  // ifftshifting positions
-  int xshift = (width1 + 1) / 2;
-  int yshift = (height1 + 1) / 2;
-  int outX = (px + xshift) % width1;
-  int outY = (py + yshift) % height1;
-
-  filtercomplex[outY * width1 + outX] = value;
-}
\ No newline at end of file
+  filter[py * width_half + px] = 1.0f / filter1;
+}
@@ -0,0 +1,19 @@
+extern "C" __global__ void reciprocal_grid(int nx, int ny, float sx, float sy,
+                                           float *grid) {
+  // the grid only covers the non-negative frequencies along y,
+  // matching the output of a real-to-complex FFT
+  int ny_half = ny / 2 + 1;
+  int j = threadIdx.x + blockIdx.x * blockDim.x;
+  int i = threadIdx.y + blockIdx.y * blockDim.y;
+  if (j >= ny_half)
+    return;
+  if (i >= nx)
+    return;
+
+  // frequencies in FFT order (zero frequency first), as in fftfreq
+  int fi = i <= (nx - 1) / 2 ? i : i - nx;
+
+  float fx = fi * sx;
+  float fy = j * sy;
+  grid[i * ny_half + j] = fx * fx + fy * fy;
+}
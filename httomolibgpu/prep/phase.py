@@ -20,6 +20,7 @@
 # ---------------------------------------------------------------------------
 """Modules for phase retrieval and phase-contrast enhancement"""
 
+import functools
 import math
 from typing import Tuple
 import cupy as cp
@@ -49,20 +50,35 @@ def _calc_max_slices_fresnel(
     dtype: np.dtype, available_memory: int, **kwargs
 ) -> Tuple[int, np.dtype, Tuple[int, int]]:
     height1, width1 = non_slice_dims_shape
-    window_size = (height1 * width1) * np.float64().nbytes
     pad_width = min(150, int(0.1 * width1))
     padded_height = height1 + 2 * pad_width
-    padded_width = width1 * 2 * pad_width
+    padded_width = width1 + 2 * pad_width
     in_slice_size = height1 * width1 * dtype.itemsize
-    # float64 here as res is internally computed in double
-    internal_slice_size = padded_height * padded_width * np.float64().nbytes
-    out_slice_size = padded_height * padded_width * np.float32().nbytes
-    slice_size = in_slice_size + out_slice_size + internal_slice_size
-    # the internal data is computed using a for loop, so the temporaries won't have
-    # a significant impact. But we add a safety margin for that
-    safety = in_slice_size * 4
-
-    available_memory -= window_size + safety
+    float_slice = height1 * width1 * np.float32().nbytes
+    window_size = float_slice
+    # the float32 result, and with apply_log the -log copy of the input. The
+    # negation and the final exp(-res) are done in place
+    slice_size = in_slice_size + float_slice
+    if kwargs.get("apply_log", True):
+        slice_size += float_slice
+    if kwargs["pattern"] == "PROJECTION":
+        # the images are padded one at a time into a complex buffer, which is
+        # transformed in place, so only the buffer and the FFT plan work area
+        # are allocated, once
+        padded_size = padded_height * padded_width
+        win_pad_size = padded_size * np.float32().nbytes
+        fixed_size = 2 * padded_size * np.complex64().nbytes
+    else:
+        # all images are padded along the rows and transformed in place in one
+        # batch, so the complex stack and the FFT plan work area scale with the
+        # number of slices. The real padded stack is released after the complex
+        # conversion, before the plan is created
+        padded_size = height1 * padded_width
+        win_pad_size = padded_size * np.float32().nbytes
+        slice_size += 2 * padded_size * np.complex64().nbytes
+        fixed_size = 0
+
+    available_memory -= window_size + win_pad_size + fixed_size
     return (available_memory // slice_size, float32(), non_slice_dims_shape)
 
 
@@ -92,7 +108,7 @@ def fresnel_filter(
     Returns
     -------
     cp.ndarray
-        The filtered data.
+        The filtered data, as float32.
     """
 
     if mat.ndim == 2:
@@ -105,7 +121,8 @@ def fresnel_filter(
         )
 
     if apply_log is True:
-        mat = -cp.log(mat)
+        mat = cp.log(mat)
+        cp.negative(mat, out=mat)
 
     # Define window
     (depth1, height1, width1) = mat.shape[:3]
@@ -126,47 +143,81 @@ def fresnel_filter(
     res_height = min(nrow, padded_height - pad_width)
     padded_width = mat.shape[2] + pad_width * 2
     res_width = min(ncol, padded_width - pad_width)
-    res = cp.zeros((mat.shape[0], res_height, res_width))
-
-    # Loop over images and apply filter
-    for i in range(mat.shape[0]):
-        if pattern == "PROJECTION":
-            top_drop = 10  # To remove the time stamp in some data
-            mat_pad = cp.pad(
-                mat[i][top_drop:],
-                ((pad_width + top_drop, pad_width), (pad_width, pad_width)),
-                mode="edge",
-            )
-            win_pad = cp.pad(window, pad_width, mode="edge")
-            mat_dec = cp.fft.ifft2(cp.fft.fft2(mat_pad) / cp.fft.ifftshift(win_pad))
-            mat_dec = cp.real(
-                mat_dec[pad_width : pad_width + nrow, pad_width : pad_width + ncol]
+    res = cp.zeros((mat.shape[0], res_height, res_width), dtype=cp.float32)
+
+    # The padded window is the same for all images, so it is prepared once,
+    # already shifted to the FFT order. Its edge padding is not symmetric in
+    # frequency, so the full spectrum is filtered with complex-to-complex
+    # transforms and the real part of the result is kept.
+    if pattern == "PROJECTION":
+        win_pad = cp.fft.ifftshift(cp.pad(window, pad_width, mode="edge"))
+    else:
+        win_pad = cp.fft.ifftshift(
+            cp.pad(window, ((0, 0), (pad_width, pad_width)), mode="edge"), axes=1
+        )
+
+    if pattern == "PROJECTION":
+        top_drop = 10  # To remove the time stamp in some data
+
+        # All images are edge padded into the same complex buffer, which is
+        # then transformed in place. This avoids allocating a new padded image,
+        # its complex copy and the spectrum per iteration
+        mat_pad = cp.empty(
+            (nrow + 2 * pad_width, ncol + 2 * pad_width), dtype=cp.complex64
+        )
+        top = pad_width + top_drop
+        bottom = pad_width + nrow
+        left = pad_width
+        right = pad_width + ncol
+
+        # The FFT plan is created once and re-used for all the images
+        plan = cupyx.scipy.fftpack.get_fft_plan(mat_pad, axes=(0, 1))
+
+        # Loop over images and apply filter
+        for i in range(mat.shape[0]):
+            mat_pad[top:bottom, left:right] = mat[i][top_drop:]
+            mat_pad[:top, left:right] = mat_pad[top, left:right]
+            mat_pad[bottom:, left:right] = mat_pad[bottom - 1, left:right]
+            mat_pad[:, :left] = mat_pad[:, left : left + 1]
+            mat_pad[:, right:] = mat_pad[:, right - 1 : right]
+
+            cupyx.scipy.fft.fft2(mat_pad, overwrite_x=True, plan=plan)
+            mat_pad /= win_pad
+            cupyx.scipy.fft.ifft2(mat_pad, overwrite_x=True, plan=plan)
+            res[i] = cp.real(
+                mat_pad[pad_width : pad_width + nrow, pad_width : pad_width + ncol]
             )
-            res[i] = mat_dec
-        else:
-            mat_pad = cp.pad(mat[i], ((0, 0), (pad_width, pad_width)), mode="edge")
-            win_pad = cp.pad(window, ((0, 0), (pad_width, pad_width)), mode="edge")
-            mat_fft = cp.fft.fftshift(cp.fft.fft(mat_pad), axes=1) / win_pad
-            mat_dec = cp.fft.ifft(cp.fft.ifftshift(mat_fft, axes=1))
-            mat_dec = cp.real(mat_dec[:, pad_width : pad_width + ncol])
-            res[i] = mat_dec
+    else:
+        # The filter only acts along the rows, so all images are padded and
+        # transformed in one batch of 1D FFTs. The padded stack is converted to
+        # complex explicitly and released, so that the transforms run in place
+        mat_pad = cp.pad(mat, ((0, 0), (0, 0), (pad_width, pad_width)), mode="edge")
+        mat_fft = cp.asarray(mat_pad, dtype=cp.complex64)
+        del mat_pad
+        plan = cupyx.scipy.fftpack.get_fft_plan(mat_fft, axes=2)
+        cupyx.scipy.fft.fft(mat_fft, axis=2, overwrite_x=True, plan=plan)
+        mat_fft /= win_pad
+        cupyx.scipy.fft.ifft(mat_fft, axis=2, overwrite_x=True, plan=plan)
+        res[:] = cp.real(mat_fft[:, :, pad_width : pad_width + ncol])
+        del mat_fft, plan
 
     if apply_log is True:
-        res = cp.exp(-res)
+        cp.negative(res, out=res)
+        cp.exp(res, out=res)
 
-    return cp.asarray(res, dtype=cp.float32)
+    return res
 
 
 def _make_window(height, width, ratio, pattern):
-    center_hei = int(cp.ceil((height - 1) * 0.5))
-    center_wid = int(cp.ceil((width - 1) * 0.5))
+    center_hei = math.ceil((height - 1) * 0.5)
+    center_wid = math.ceil((width - 1) * 0.5)
     if pattern == "PROJECTION":
-        ulist = (1.0 * cp.arange(0, width) - center_wid) / width
-        vlist = (1.0 * cp.arange(0, height) - center_hei) / height
+        ulist = (cp.arange(0, width, dtype=cp.float32) - center_wid) / width
+        vlist = (cp.arange(0, height, dtype=cp.float32) - center_hei) / height
         u, v = cp.meshgrid(ulist, vlist)
         win2d = 1.0 + ratio * (u**2 + v**2)
     else:
-        ulist = (1.0 * cp.arange(0, width) - center_wid) / width
+        ulist = (cp.arange(0, width, dtype=cp.float32) - center_wid) / width
         win1d = 1.0 + ratio * ulist**2
         win2d = cp.tile(win1d, (height, 1))
 
@@ -180,15 +231,18 @@ def _calc_max_slices_paganin_filter(
     pad_x = kwargs["pad_x"]
     pad_y = kwargs["pad_y"]
     input_size = np.prod(non_slice_dims_shape) * dtype.itemsize
-    in_slice_size = (
-        (non_slice_dims_shape[0] + 2 * pad_y) * (non_slice_dims_shape[1] + 2 * pad_x) * dtype.itemsize
-    )
-    # FFT needs complex inputs, so copy to complex happens first
-    complex_slice = in_slice_size / dtype.itemsize * np.complex64().nbytes
+    height1 = non_slice_dims_shape[0] + 2 * pad_y
+    width1 = non_slice_dims_shape[1] + 2 * pad_x
+    # the padded input is converted to float32 (no copy for float32 inputs) and
+    # transformed with a real-to-complex FFT, which only keeps half of the spectrum.
+    # The padded stack and the forward plan are released before the inverse
+    # transform, so only one plan work area is alive at a time. The result array
+    # is only allocated after the spectrum has been released.
+    real_slice = height1 * width1 * np.float32().nbytes
+    complex_slice = height1 * (width1 // 2 + 1) * np.complex64().nbytes
     fftplan_slice = complex_slice
-    filter_size = complex_slice
-    res_slice = np.prod(non_slice_dims_shape) * np.float32().nbytes    
-    slice_size = input_size + in_slice_size + complex_slice + fftplan_slice + res_slice
+    filter_size = height1 * (width1 // 2 + 1) * np.float32().nbytes
+    slice_size = input_size + real_slice + complex_slice + fftplan_slice
     available_memory -= filter_size
     return (int(available_memory // slice_size), float32(), non_slice_dims_shape)
 
@@ -212,6 +266,11 @@ def paganin_filter(
     Apply Paganin filter (for denoising or contrast enhancement) to
     projections.
 
+    The filter is centred on the zero frequency for both odd and even padded
+    sizes. The Savu implementation it was ported from places the centre one
+    frequency bin off for even sizes, so the results no longer match Savu: the
+    filtered values differ by a nearly uniform offset.
+
     Parameters
     ----------
     data : cp.ndarray
@@ -267,29 +326,22 @@ def paganin_filter(
     height1 = height + 2 * pad_y
     width1 = width + 2 * pad_x
 
-    # Define the paganin filter, taking into account the padding that will be
-    # applied to the projections (if any)
-
-    # Using raw kernel her as indexing is direct and it avoids a lot of temporaries
-    # and tiny kernels
-    module = load_cuda_module("paganin_filter_gen")
-    kernel = module.get_function("paganin_filter_gen")
-
     # Apply padding to all the 2D projections
     # Note: this takes considerable time on GPU...
     data = cp.pad(data, ((0, 0), (pad_y, pad_y), (pad_x, pad_x)), mode=pad_method)
 
-    # Define array to hold result, which will not have the padding applied to it
+    # Precondition the padded data and convert it to float32 for the FFT in a
+    # single pass (in-place for float32 inputs)
     precond_kernel_float = cp.ElementwiseKernel(
         "T data",
-        "T out",
+        "float32 out",
         """
         if (isnan(data)) {
-            out = T(0); 
+            out = 0.0f; 
         } else if (isinf(data)) {
             out = data < 0.0 ? -3.402823e38f : 3.402823e38f;  // FLT_MAX, not available in cupy
         } else if (data == 0.0) {
-            out = 1.0;
+            out = 1.0f;
         } else {
             out = data;
         }
@@ -299,48 +351,54 @@ def paganin_filter(
     )
     precond_kernel_int = cp.ElementwiseKernel(
         "T data",
-        "T out",
-        """out = data == 0 ? 1 : data""",
+        "float32 out",
+        """out = data == 0 ? 1.0f : (float)data""",
         name="paganin_precond_int",
         no_return=True,
     )
 
+    if data.dtype == cp.float32:
+        out = data
+    else:
+        out = cp.empty(data.shape, dtype=cp.float32)
     if data.dtype == cp.float32 or data.dtype == cp.float64:
-        precond_kernel_float(data, data)
+        precond_kernel_float(data, out)
     else:
-        precond_kernel_int(data, data)
+        precond_kernel_int(data, out)
+    data = out
+    del out
 
     # avoid normalising in both directions - we include multiplier in the post_kernel
-    data = cp.asarray(data, dtype=cp.complex64)
-    data = cupyx.scipy.fft.fft2(data, axes=(-2, -1), overwrite_x=True, norm="backward")
+    plan = cupyx.scipy.fftpack.get_fft_plan(data, axes=(-2, -1), value_type="R2C")
+    data = cupyx.scipy.fft.rfft2(data, axes=(-2, -1), norm="backward", plan=plan)
+    # the padded stack is released with the rebinding above, and the forward
+    # plan is released here, before the inverse transform allocates its own
+    # work area and output
+    del plan
 
     # prepare filter here, while the GPU is busy with the FFT
-    filtercomplex = cp.empty((height1, width1), dtype=np.complex64)
-    bx = 16
-    by = 8
-    gx = (width1 + bx - 1) // bx
-    gy = (height1 + by - 1) // by
-    kernel(
-        grid=(gx, gy, 1),
-        block=(bx, by, 1),
-        args=(
-            cp.int32(width1),
-            cp.int32(height1),
-            cp.float32(resolution),
-            cp.float32(wavelength),
-            cp.float32(distance),
-            cp.float32(ratio),
-            filtercomplex,
-        ),
+    phase_filter = _build_paganin_filter(
+        cp.cuda.Device().id, height1, width1, resolution, wavelength, distance, ratio
     )
-    data *= filtercomplex
+    data *= phase_filter
 
-    data = cupyx.scipy.fft.ifft2(data, axes=(-2, -1), overwrite_x=True, norm="forward")
+    plan = cupyx.scipy.fftpack.get_fft_plan(
+        data, shape=(height1, width1), axes=(-2, -1), value_type="C2R"
+    )
+    data = cupyx.scipy.fft.irfft2(
+        data,
+        s=(height1, width1),
+        axes=(-2, -1),
+        overwrite_x=True,
+        norm="forward",
+        plan=plan,
+    )
+    del plan
 
     post_kernel = cp.ElementwiseKernel(
-        "C pci1, raw float32 increment, raw float32 ratio, raw float32 fft_scale",
+        "T pci1, raw float32 increment, raw float32 ratio, raw float32 fft_scale",
         "T out",
-        "out = -0.5 * ratio * log(abs(pci1) * fft_scale + increment)",
+        "out = -0.5 * ratio * log(fabs(pci1) * fft_scale + increment)",
         name="paganin_post_proc",
         no_return=True,
     )
@@ -357,6 +415,72 @@ def paganin_filter(
     return res
 
 
+@functools.lru_cache(maxsize=1)
+def _build_paganin_filter(
+    device_id: int,
+    height1: int,
+    width1: int,
+    resolution: float,
+    wavelength: float,
+    distance: float,
+    ratio: float,
+) -> cp.ndarray:
+    """
+    Build the Paganin filter for the half spectrum of the real-to-complex FFT
+    of padded projections of the given size. Only the last filter is cached,
+    and it stays on the GPU between calls.
+
+    Parameters
+    ----------
+    device_id : int
+        Id of the GPU the filter is created on.
+    height1, width1 : int
+        Size of the padded projections.
+    resolution : float
+        Pixel size in metres.
+    wavelength : float
+        Wavelength of the beam in metres.
+    distance : float
+        Distance from sample to detector in metres.
+    ratio : float
+        Ratio of delta/beta.
+
+    Returns
+    -------
+    ndarray
+        Float32 filter of shape (height1, width1 // 2 + 1), in FFT order.
+    """
+    # Define the paganin filter, taking into account the padding that will be
+    # applied to the projections (if any)
+
+    # Using raw kernel her as indexing is direct and it avoids a lot of temporaries
+    # and tiny kernels
+    module = load_cuda_module("paganin_filter_gen")
+    kernel = module.get_function("paganin_filter_gen")
+
+    # The Paganin denominator is real, so the filter is kept in float32 and
+    # multiplied directly with the complex spectrum
+    phase_filter = cp.empty((height1, width1 // 2 + 1), dtype=np.float32)
+    bx = 16
+    by = 8
+    gx = (width1 // 2 + 1 + bx - 1) // bx
+    gy = (height1 + by - 1) // by
+    kernel(
+        grid=(gx, gy, 1),
+        block=(bx, by, 1),
+        args=(
+            cp.int32(width1),
+            cp.int32(height1),
+            cp.float32(resolution),
+            cp.float32(wavelength),
+            cp.float32(distance),
+            cp.float32(ratio),
+            phase_filter,
+        ),
+    )
+    return phase_filter
+
+
 def _calc_max_slice_retrieve_phase(
     non_slice_dims_shape: Tuple[int, int],
     dtype: np.dtype, 
@@ -370,20 +494,24 @@ def _calc_max_slice_retrieve_phase(
     dist = kwargs["dist"]
     py = _calc_pad_width(dy, pixel_size, wavelength, dist)
     pz = _calc_pad_width(dz, pixel_size, wavelength, dist)
-    # x 2 for ifftshift
-    grid_size = (dy + 2 * py) * (dz + 2 * pz) * np.float64().nbytes * 2
-    prj_size = (dy + 2 * py) * (dz + 2 * pz) * np.float32().nbytes * 2
-    prj_complex_size = int(prj_size * 1.85)
+    ny, nz = dy + 2 * py, dz + 2 * pz
+    # reciprocal grid and the filter built from it, both for the half spectrum
+    grid_size = ny * (nz // 2 + 1) * np.float32().nbytes * 2
+    # all projections are padded and transformed in one batch, so the padded
+    # stack, its (half) spectrum and the FFT plan work area scale with the
+    # slices. The padded stack is released before the inverse transform, which
+    # then needs the same amount of memory for its output.
+    prj_size = ny * nz * np.float32().nbytes
+    prj_complex_size = ny * (nz // 2 + 1) * np.complex64().nbytes
     fftplan_size = prj_complex_size
-    prj_ret_size = prj_complex_size
-    # the code goes through the projections line by line,
-    # which doesn't need any significant memory compared to the slices
-    # it also updates the inputs in-place
 
-    available_memory -= (
-        grid_size + prj_complex_size + prj_size + fftplan_size + prj_ret_size
+    available_memory -= grid_size
+    slice_memory = (
+        np.prod(non_slice_dims_shape) * dtype.itemsize
+        + prj_size
+        + prj_complex_size
+        + fftplan_size
     )
-    slice_memory = np.prod(non_slice_dims_shape) * dtype.itemsize
     return (available_memory // slice_memory, dtype, non_slice_dims_shape)
 
 
@@ -416,7 +544,7 @@ def retrieve_phase(
     alpha : float, optional
         Regularization parameter.
     pad : bool, optional
-        If True, extend the size of the projections by padding with zeros.
+        If True, extend the size of the projections by replicating their edges.
 
     Returns
     -------
@@ -434,20 +562,17 @@ def retrieve_phase(
             " please provide a stack of 2D projections."
         )
 
-    # New dimensions and pad value after padding.
-    py, pz, val = _calc_pad(tomo, pixel_size, dist, energy, pad)
-
-    # Compute the reciprocal grid.
-    _, dy, dz = tomo.shape
-    w2 = _reciprocal_grid(pixel_size, dy + 2 * py, dz + 2 * pz)
+    # New dimensions after padding.
+    py, pz = _calc_pad(tomo, pixel_size, dist, energy, pad)
 
     # Filter in Fourier space.
-    phase_filter = cp.fft.fftshift(_paganin_filter_factor(energy, dist, alpha, w2))
-
-    prj = cp.full((dy + 2 * py, dz + 2 * pz), val, dtype=cp.float32)
+    _, dy, dz = tomo.shape
+    phase_filter = _build_phase_filter(
+        cp.cuda.Device().id, dy + 2 * py, dz + 2 * pz, pixel_size, dist, energy, alpha
+    )
 
     # Apply phase retrieval
-    return _retrieve_phase(tomo, phase_filter, py, pz, prj, pad)
+    return _retrieve_phase(tomo, phase_filter, py, pz)
 
 
 def _retrieve_phase(
@@ -455,36 +580,90 @@ def _retrieve_phase(
     phase_filter: cp.ndarray,
     px: int,
     py: int,
-    prj: cp.ndarray,
-    pad: bool,
 ) -> cp.ndarray:
     _, dy, dz = tomo.shape
-    num_projs = tomo.shape[0]
-    normalized_phase_filter = phase_filter / phase_filter.max()
-    for m in range(num_projs):
-        prj[px : dy + px, py : dz + py] = tomo[m]
-        prj[:px] = prj[px]
-        prj[-px:] = prj[-px - 1]
-        prj[:, :py] = prj[:, py][:, cp.newaxis]
-        prj[:, -py:] = prj[:, -py - 1][:, cp.newaxis]
-        # TomoPy has its own 2D FFT implementations
-        # https://github.com/tomopy/tomopy/blob/master/source/tomopy/util/misc.py,
-        # the NumPy equivalent in CuPy has been used as an alternative
-        # https://docs.cupy.dev/en/stable/reference/generated/cupy.fft.fft2.html#.
-        fproj = cp.fft.fft2(prj)
-        fproj *= normalized_phase_filter
-        proj = cp.real(cp.fft.ifft2(fproj))
-        if pad:
-            proj = proj[px : dy + px, py : dz + py]
-        tomo[m] = proj
+
+    # Pad the whole stack at once, so all projections are transformed in one batch
+    prj = cp.pad(
+        cp.asarray(tomo, dtype=cp.float32), ((0, 0), (px, px), (py, py)), mode="edge"
+    )
+
+    # TomoPy has its own 2D FFT implementations
+    # https://github.com/tomopy/tomopy/blob/master/source/tomopy/util/misc.py,
+    # the NumPy equivalent in CuPy has been used as an alternative
+    # https://docs.cupy.dev/en/stable/reference/generated/cupy.fft.fft2.html#.
+    shape = prj.shape[1:]
+    plan = cupyx.scipy.fftpack.get_fft_plan(prj, axes=(1, 2), value_type="R2C")
+    fproj = cupyx.scipy.fft.rfft2(prj, axes=(1, 2), plan=plan)
+    # the padded stack and the forward plan are not needed anymore, so release
+    # them before the inverse transform allocates its work area and output
+    del prj, plan
+
+    # filtering is the only elementwise pass over the spectrum, and cropping to
+    # the original size is done in the same copy that writes back to the input
+    fproj *= phase_filter
+    plan = cupyx.scipy.fftpack.get_fft_plan(
+        fproj, shape=shape, axes=(1, 2), value_type="C2R"
+    )
+    proj = cupyx.scipy.fft.irfft2(
+        fproj, s=shape, axes=(1, 2), norm="forward", overwrite_x=True, plan=plan
+    )
+    tomo[:] = proj[:, px : dy + px, py : dz + py]
     return tomo
 
 
+@functools.lru_cache(maxsize=1)
+def _build_phase_filter(
+    device_id: int,
+    ny: int,
+    nz: int,
+    pixel_size: float,
+    dist: float,
+    energy: float,
+    alpha: float,
+) -> cp.ndarray:
+    """
+    Build the normalized phase retrieval filter for padded projections of the
+    given size. Only the last filter is cached, and it stays on the GPU between
+    calls.
+
+    Parameters
+    ----------
+    device_id : int
+        Id of the GPU the filter is created on.
+    ny, nz : int
+        Size of the padded projections.
+    pixel_size : float
+        Detector pixel size in cm.
+    dist : float
+        Propagation distance of the wavefront in cm.
+    energy : float
+        Energy of incident wave in keV.
+    alpha : float
+        Regularization parameter.
+
+    Returns
+    -------
+    ndarray
+        Filter for the half spectrum of the real-to-complex FFT, normalized to
+        a maximum of 1 and including the inverse FFT normalisation.
+    """
+    # Compute the reciprocal grid, only for the half spectrum of the
+    # real-to-complex FFT. It is in FFT order already, so no shift is needed.
+    w2 = _reciprocal_grid(pixel_size, ny, nz)
+    phase_filter = _paganin_filter_factor(energy, dist, alpha, w2)
+    # the maximum of 1 / alpha is at zero frequency, so the filter is normalized
+    # analytically. The inverse FFT normalisation is folded in as well, to avoid
+    # a separate scaling pass over the whole spectrum after the inverse transform
+    phase_filter *= alpha / (ny * nz)
+    return phase_filter
+
+
 def _calc_pad(
     tomo: cp.ndarray, pixel_size: float, dist: float, energy: float, pad: bool
-) -> tuple[int, int, float]:
+) -> tuple[int, int]:
     """
-    Calculate new dimensions and pad value after padding.
+    Calculate new dimensions after padding.
 
     Parameters
     ----------
@@ -497,7 +676,7 @@ def _calc_pad(
     energy : float
         Energy of incident wave in keV.
     pad : bool
-        If True, extend the size of the projections by padding with zeros.
+        If True, extend the size of the projections by edge padding.
 
     Returns
     -------
@@ -505,17 +684,14 @@ def _calc_pad(
         Pad amount in projection axis.
     int
         Pad amount in sinogram axis.
-    float
-        Pad value.
     """
     _, dy, dz = tomo.shape
     wavelength = _wavelength(energy)
-    py, pz, val = 0, 0, 0.0
+    py, pz = 0, 0
     if pad:
-        val = _calc_pad_val(tomo)
         py = _calc_pad_width(dy, pixel_size, wavelength, dist)
         pz = _calc_pad_width(dz, pixel_size, wavelength, dist)
-    return py, pz, val
+    return py, pz
 
 
 def _wavelength(energy: float) -> float:
@@ -529,17 +705,14 @@ def _paganin_filter_factor(
 
 
 def _calc_pad_width(dim: int, pixel_size: float, wavelength: float, dist: float) -> int:
-    pad_pix = cp.ceil(PI * wavelength * dist / pixel_size**2)
-    return int((pow(2, cp.ceil(cp.log2(dim + pad_pix))) - dim) * 0.5)
-
-
-def _calc_pad_val(tomo: cp.ndarray) -> float:
-    return cp.mean((tomo[..., 0] + tomo[..., -1]) * 0.5)
+    pad_pix = math.ceil(PI * wavelength * dist / pixel_size**2)
+    return int((pow(2, math.ceil(math.log2(dim + pad_pix))) - dim) * 0.5)
 
 
 def _reciprocal_grid(pixel_size: float, nx: int, ny: int) -> cp.ndarray:
     """
-    Calculate reciprocal grid.
+    Calculate the squared reciprocal grid coordinates, for the half spectrum of
+    a real-to-complex FFT.
 
     Parameters
     ----------
@@ -551,46 +724,29 @@ def _reciprocal_grid(pixel_size: float, nx: int, ny: int) -> cp.ndarray:
     Returns
     -------
     ndarray
-        Grid coordinates.
-    """
-    # Sampling in reciprocal space.
-    indx = _reciprocal_coord(pixel_size, nx)
-    indy = _reciprocal_coord(pixel_size, ny)
-    cp.square(indx, out=indx)
-    cp.square(indy, out=indy)
-    # TODO: Explicitly generate the result equivalent to `np.add.outer()` using
-    # nested loops, since CuPy doesn't yet have a released version which
-    # provides `ufunc.outer`, see https://github.com/cupy/cupy/pull/7049,
-    # https://github.com/cupy/cupy/issues/7082, and
-    # https://github.com/cupy/cupy/issues/6866.
-    #
-    # When `ufunc.outer` is supported in CuPy, this code can be updated
-    # accordingly.
-    grid = cp.empty((len(indx), len(indy)))
-    for i in range(len(indx)):
-        for j in range(len(indy)):
-            grid[i, j] = cp.add(indx[i], indy[j])
-    return grid
-
-
-def _reciprocal_coord(pixel_size: float, num_grid: int) -> cp.ndarray:
+        Squared grid coordinates of shape (nx, ny // 2 + 1), in FFT order
+        (zero frequency first).
     """
-    Calculate reciprocal grid coordinates for a given pixel size
-    and discretization.
+    # Using a raw kernel, so the grid is written in a single pass without
+    # any temporaries
+    module = load_cuda_module("reciprocal_grid")
+    kernel = module.get_function("reciprocal_grid")
 
-    Parameters
-    ----------
-    pixel_size : float
-        Detector pixel size in cm.
-    num_grid : int
-        Size of the reciprocal grid.
-
-    Returns
-    -------
-    ndarray
-        Grid coordinates.
-    """
-    n = num_grid - 1
-    rc = cp.arange(-n, num_grid, 2, dtype=cp.float32)
-    rc *= 0.5 / (n * pixel_size)
-    return rc
+    ny_half = ny // 2 + 1
+    grid = cp.empty((nx, ny_half), dtype=cp.float32)
+    bx = 16
+    by = 8
+    gx = (ny_half + bx - 1) // bx
+    gy = (nx + by - 1) // by
+    kernel(
+        grid=(gx, gy, 1),
+        block=(bx, by, 1),
+        args=(
+            cp.int32(nx),
+            cp.int32(ny),
+            cp.float32(1.0 / (nx * pixel_size)),
+            cp.float32(1.0 / (ny * pixel_size)),
+            grid,
+        ),
+    )
+    return grid
@@ -4,7 +4,14 @@ import cupy as cp
 import numpy as np
 import pytest
 from cupy.cuda import nvtx
-from httomolibgpu.prep.phase import fresnel_filter, paganin_filter, retrieve_phase
+from httomolibgpu.prep.phase import (
+    _build_paganin_filter,
+    _build_phase_filter,
+    _reciprocal_grid,
+    fresnel_filter,
+    paganin_filter,
+    retrieve_phase,
+)
 from numpy.testing import assert_allclose
 from httomolibgpu import method_registry
 from tests import MaxMemoryHook
@@ -12,6 +19,17 @@ from tests import MaxMemoryHook
 eps = 1e-6
 
 
+@pytest.fixture(autouse=True)
+def clear_filter_caches():
+    # the phase filters are cached on the GPU between calls, so they are
+    # cleared to keep the tests, and their memory measurements, independent
+    _build_paganin_filter.cache_clear()
+    _build_phase_filter.cache_clear()
+    yield None
+    _build_paganin_filter.cache_clear()
+    _build_phase_filter.cache_clear()
+
+
 @cp.testing.gpu
 def test_fresnel_filter_projection(data):
     # --- testing the Fresnel filter on tomo_standard ---#
@@ -20,8 +38,8 @@ def test_fresnel_filter_projection(data):
     filtered_data = fresnel_filter(data, pattern, ratio).get()
 
     assert_allclose(np.mean(filtered_data), 802.1125, rtol=eps)
-    assert_allclose(np.max(filtered_data), 1039.5293)
-    assert_allclose(np.min(filtered_data), 95.74562)
+    assert_allclose(np.max(filtered_data), 1039.5293, rtol=eps)
+    assert_allclose(np.min(filtered_data), 95.74562, rtol=eps)
 
     #: make sure the output is float32
     assert filtered_data.dtype == np.float32
@@ -36,8 +54,8 @@ def test_fresnel_filter_sinogram(data):
     filtered_data = fresnel_filter(data, pattern, ratio).get()
 
     assert_allclose(np.mean(filtered_data), 806.74347, rtol=eps)
-    assert_allclose(np.max(filtered_data), 1063.7007)
-    assert_allclose(np.min(filtered_data), 87.91508)
+    assert_allclose(np.max(filtered_data), 1063.7007, rtol=eps)
+    assert_allclose(np.min(filtered_data), 87.91508, rtol=eps)
 
     #: make sure the output is float32
     assert filtered_data.dtype == np.float32
@@ -52,14 +70,41 @@ def test_fresnel_filter_1D_raises(ensure_clean_memory):
     _data = None  #: free up GPU memory
 
 
+@cp.testing.gpu
+@pytest.mark.parametrize("pattern", ["PROJECTION", "SINOGRAM"])
+@pytest.mark.parametrize("slices", [15, 51, 160])
+@pytest.mark.parametrize("dtype", [np.uint16, np.float32])
+def test_fresnel_filter_meta(pattern, slices, dtype, ensure_clean_memory):
+    kwargs = dict(pattern=pattern, ratio=100.0)
+    data = cp.random.random_sample((slices, 111, 121), dtype=np.float32) + 0.5
+    if dtype == np.uint16:
+        data = cp.asarray(data * 300.0, dtype=np.uint16)
+    hook = MaxMemoryHook(data.size * data.itemsize)
+    with hook:
+        fresnel_filter(data, **kwargs)
+
+    # make sure estimator function is within range (80% min, 100% max)
+    max_mem = hook.max_mem
+    actual_slices = data.shape[0]
+    estimated_slices, dtype_out, output_dims = fresnel_filter.meta.calc_max_slices(
+        0,
+        (data.shape[1], data.shape[2]),
+        data.dtype, max_mem, **kwargs)
+    assert estimated_slices <= actual_slices
+    assert estimated_slices / actual_slices >= 0.8
+    assert output_dims == (data.shape[1], data.shape[2])
+
+    assert 'fresnel_filter' in method_registry['httomolibgpu']['prep']['phase']
+
+
 @cp.testing.gpu
 def test_paganin_filter(data):
     # --- testing the Paganin filter on tomo_standard ---#
     filtered_data = paganin_filter(data).get()
     
     assert filtered_data.ndim == 3
-    assert_allclose(np.mean(filtered_data), -770.5339, rtol=eps)
-    assert_allclose(np.max(filtered_data), -679.80945, rtol=eps)
+    assert_allclose(np.mean(filtered_data), -837.2863, rtol=eps)
+    assert_allclose(np.max(filtered_data), -762.8943, rtol=eps)
 
     #: make sure the output is float32
     assert filtered_data.dtype == np.float32
@@ -97,8 +142,8 @@ def test_paganin_filter_meta(pad, slices, dtype, ensure_clean_memory):
 def test_paganin_filter_energy100(data):
     filtered_data = paganin_filter(data, energy=100.0).get()
 
-    assert_allclose(np.mean(filtered_data), -778.61926, rtol=1e-05)
-    assert_allclose(np.min(filtered_data), -808.9013, rtol=eps)
+    assert_allclose(np.mean(filtered_data), -834.7292, rtol=1e-05)
+    assert_allclose(np.min(filtered_data), -864.24976, rtol=eps)
 
     assert filtered_data.ndim == 3
     assert filtered_data.dtype == np.float32
@@ -108,20 +153,20 @@ def test_paganin_filter_energy100(data):
 def test_paganin_filter_padmean(data):
     filtered_data = paganin_filter(data, pad_method="mean").get()
 
-    assert_allclose(np.mean(filtered_data), -765.3401, rtol=eps)
-    assert_allclose(np.min(filtered_data), -793.68787, rtol=eps)
+    assert_allclose(np.mean(filtered_data), -830.9609, rtol=eps)
+    assert_allclose(np.min(filtered_data), -856.97766, rtol=eps)
     # test a few other slices to ensure shifting etc is right
     assert_allclose(
         filtered_data[0, 50, 1:5],
-        [-785.60736, -786.20215, -786.7521, -787.25494],
+        [-849.83325, -850.2997, -850.7257, -851.10956],
         rtol=eps,
     )
     assert_allclose(
-        filtered_data[0, 50, 40:42], [-776.6436, -775.1906], rtol=eps, atol=1e-5
+        filtered_data[0, 50, 40:42], [-839.42535, -838.1222], rtol=eps, atol=1e-5
     )
     assert_allclose(
         filtered_data[0, 60:63, 90],
-        [-737.75104, -736.6097, -735.49884],
+        [-807.43964, -806.44446, -805.4731],
         rtol=eps,
         atol=1e-5,
     )
@@ -205,8 +250,8 @@ def test_retrieve_phase(data):
     phase_data = retrieve_phase(data).get()
 
     assert phase_data.shape == (180, 128, 160)
-    assert np.sum(phase_data) == 2994544952
-    assert_allclose(np.mean(phase_data), 812.3223068576389, rtol=1e-7)
+    assert_allclose(np.sum(phase_data), 2995163695, rtol=1e-7)
+    assert_allclose(np.mean(phase_data), 812.4901516384549, rtol=1e-7)
     #: retrieve_phase can give uint16 or float32 output
     assert phase_data.dtype == np.uint16
 
@@ -240,7 +285,51 @@ def test_retrieve_phase_meta(data, ensure_clean_memory):
 def test_retrieve_phase_energy100_nopad(data):
     phase_data = retrieve_phase(data, dist=34.3, energy=100.0, pad=False).get()
 
-    assert_allclose(np.mean(phase_data), 979.527778, rtol=1e-7)
-    assert_allclose(np.std(phase_data), 30.053735, rtol=1e-7)
+    assert_allclose(np.mean(phase_data), 808.549712, rtol=1e-7)
+    assert_allclose(np.std(phase_data), 252.475995, rtol=1e-6)
 
     assert phase_data.dtype == np.uint16
+
+
+@cp.testing.gpu
+@pytest.mark.parametrize(
+    "method, build_filter",
+    [(paganin_filter, _build_paganin_filter), (retrieve_phase, _build_phase_filter)],
+    ids=["paganin_filter", "retrieve_phase"],
+)
+def test_phase_filter_cache_energy(data, method, build_filter):
+    #: retrieve_phase writes its result into the input, so each call gets a copy
+    result = method(cp.copy(data)).get()
+    result_e100 = method(cp.copy(data), energy=100.0).get()
+
+    #: the cached filter must not be re-used for a different energy
+    assert not np.allclose(result, result_e100)
+
+    build_filter.cache_clear()
+    assert_allclose(result_e100, method(cp.copy(data), energy=100.0).get())
+
+
+@cp.testing.gpu
+@pytest.mark.parametrize("nx, ny", [(128, 160), (127, 161), (128, 161), (127, 160)])
+def test_half_spectrum_filters(nx, ny, ensure_clean_memory):
+    #: both filter kernels must match the NumPy frequencies for odd and even sizes
+    pixel_size = 1.28e-6
+    wavelength = (1240.0 / 53000.0) * 1e-9
+    distance = 1.0
+    ratio = 250.0
+    w2 = np.add.outer(
+        np.fft.fftfreq(nx, pixel_size) ** 2, np.fft.rfftfreq(ny, pixel_size) ** 2
+    )
+
+    grid = _reciprocal_grid(pixel_size, nx, ny).get()
+    assert grid.shape == (nx, ny // 2 + 1)
+    assert grid.dtype == np.float32
+    assert_allclose(grid, w2, rtol=1e-5)
+
+    phase_filter = _build_paganin_filter(
+        cp.cuda.Device().id, nx, ny, pixel_size, wavelength, distance, ratio
+    ).get()
+    expected = 1.0 / (1.0 + ratio * w2 * wavelength * distance * np.pi)
+    assert phase_filter.shape == (nx, ny // 2 + 1)
+    assert phase_filter.dtype == np.float32
+    assert_allclose(phase_filter, expected, rtol=1e-5)